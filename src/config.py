@@ -23,6 +23,7 @@ class Config:
             "share": "",
             "mount_point": "/mnt/nas/printer-footage",
             "username": "",
+            "queue_max": "32",
         },
         "timelapse": {
             "capture_interval": "30",
@@ -42,7 +43,11 @@ class Config:
             "frame_rate": "10",
             "rotation": "180",
             "crf": "18",
-            "preset": "medium",
+            "preset": "veryfast",
+            "tune": "none",
+            "x264_params": "",
+            "encoder": "auto",
+            "min_frames": "30",
         },
     }
 
@@ -119,6 +124,11 @@ class Config:
     def nas_username(self) -> str:
         return self.get("nas", "username")
 
+    @property
+    def nas_queue_max(self) -> int:
+        # Frames buffered for the NAS writer before the oldest is dropped
+        return max(self.get_int("nas", "queue_max", 32), 1)
+
     @property
     def capture_interval(self) -> int:
         return self.get_int("timelapse", "capture_interval", 30)
@@ -183,7 +193,31 @@ class Config:
     def video_preset(self) -> str:
         preset = self.get("video", "preset", "veryfast")
         valid = ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"]
-        return preset if preset in valid else "medium"
+        return preset if preset in valid else "veryfast"
+
+    @property
+    def video_tune(self) -> str:
+        # libx264 -tune; "none" leaves x264's defaults alone
+        tune = self.get("video", "tune", "none")
+        valid = ["none", "film", "animation", "grain", "stillimage"]
+        return tune if tune in valid else "none"
+
+    @property
+    def video_x264_params(self) -> str:
+        # Passed to libx264 as -x264-params, e.g. "rc-lookahead=10:bframes=0".
+        # Drop a trailing "# comment": configparser keeps inline comments
+        return self.get("video", "x264_params", "").split("#", 1)[0].strip()
+
+    @property
+    def video_encoder(self) -> str:
+        # auto = Pi hardware encoder when present, else libx264
+        encoder = self.get("video", "encoder", "auto")
+        return encoder if encoder in ("auto", "libx264", "h264_v4l2m2m") else "auto"
+
+    @property
+    def video_min_frames(self) -> int:
+        # Sessions with fewer frames are completed without a video
+        return max(self.get_int("video", "min_frames", 30), 1)
 
     def is_configured(self) -> bool:
         """Check if essential configuration is present."""
@@ -1,8 +1,8 @@
 """NAS/SMB mount handling for timelapse storage."""
 
 import os
-import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -33,6 +33,7 @@ class NASMount:
         self.share_path = share_path.lstrip("/")
         self.mount_point = Path(mount_point)
         self.username = username
+        self._probe_thread: Optional[threading.Thread] = None
 
     @property
     def smb_path(self) -> str:
@@ -166,19 +167,26 @@ class NASMount:
         errno 19 'No such device' on access). This does a real stat check
         with a timeout to prevent blocking on hung CIFS mounts.
         """
-        def _timeout_handler(signum, frame):
-            raise OSError("NAS health check timed out")
-
-        old_handler = signal.signal(signal.SIGALRM, _timeout_handler)
-        signal.alarm(timeout)
-        try:
-            os.stat(str(self.mount_point))
-            return True
-        except OSError:
+        # The stat runs on a daemon thread rather than under SIGALRM, so it
+        # works off the main thread and leaves the services' signal handlers
+        # alone. A stat stuck on a hung mount never returns: report unhealthy
+        # until it does instead of stacking more threads behind it.
+        if self._probe_thread is not None and self._probe_thread.is_alive():
             return False
-        finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
+
+        result = []
+
+        def _probe():
+            try:
+                os.stat(str(self.mount_point))
+                result.append(True)
+            except OSError:
+                pass
+
+        self._probe_thread = threading.Thread(target=_probe, name="nas-probe", daemon=True)
+        self._probe_thread.start()
+        self._probe_thread.join(timeout)
+        return bool(result)
 
     def try_remount(self) -> bool:
         """Attempt to recover a stale NAS mount.
@@ -213,6 +221,9 @@ class NASMount:
                 text=True,
                 timeout=30,
             )
+            # A probe stuck on the old mount would make is_healthy() report
+            # failure without looking; probe the new mount afresh
+            self._probe_thread = None
             if result.returncode == 0 and self.is_healthy():
                 print("NAS remount successful")
                 return True
@@ -1,7 +1,7 @@
 """PrusaLink local API for printer status monitoring."""
 
 import requests
-from typing import Optional
+from typing import Optional, Union
 from dataclasses import dataclass
 
 
@@ -20,6 +20,10 @@ class PrinterState:
 # Terminal states that mean the job has ended
 TERMINAL_STATES = {"FINISHED", "STOPPED", "ERROR"}
 
+# (connect, read) timeouts: fail fast when the printer is off the network,
+# but give a busy printer time to answer
+DEFAULT_TIMEOUT = (3, 10)
+
 
 class PrinterStatus:
     """Monitors printer status via PrusaLink local API."""
@@ -35,6 +39,11 @@ class PrinterStatus:
         self.printer_ip = printer_ip
         self.api_key = api_key
         self.base_url = f"http://{printer_ip}"
+        # Reuse one keep-alive connection across polls
+        self._session = requests.Session()
+        # Last parsed status and its ETag, reused when PrusaLink answers 304
+        self._etag: Optional[str] = None
+        self._last_state: Optional[PrinterState] = None
 
     def _get_headers(self) -> dict:
         """Get API request headers."""
@@ -43,7 +52,7 @@ class PrinterStatus:
             "Accept": "application/json",
         }
 
-    def get_status(self, timeout: int = 10) -> Optional[PrinterState]:
+    def get_status(self, timeout: Union[float, tuple] = DEFAULT_TIMEOUT) -> Optional[PrinterState]:
         """
         Get current printer status from PrusaLink.
 
@@ -51,14 +60,20 @@ class PrinterStatus:
             PrinterState object or None on error.
         """
         url = f"{self.base_url}/api/v1/status"
+        headers = self._get_headers()
+        if self._etag and self._last_state:
+            headers["If-None-Match"] = self._etag
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 url,
-                headers=self._get_headers(),
+                headers=headers,
                 timeout=timeout,
             )
 
+            if response.status_code == 304 and self._last_state:
+                return self._last_state
+
             if response.status_code != 200:
                 return None
 
@@ -86,7 +101,7 @@ class PrinterStatus:
             # This remains True during PAUSED/ATTENTION states
             is_job_active = job_id is not None and job_state not in TERMINAL_STATES
 
-            return PrinterState(
+            state = PrinterState(
                 is_printing=is_printing,
                 is_job_active=is_job_active,
                 state_text=state_text,
@@ -94,6 +109,9 @@ class PrinterStatus:
                 job_name=job_name,
                 progress=progress,
             )
+            self._etag = response.headers.get("ETag")
+            self._last_state = state
+            return state
 
         except requests.RequestException:
             return None
@@ -115,10 +133,10 @@ class PrinterStatus:
         url = f"{self.base_url}/api/v1/status"
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 url,
                 headers=self._get_headers(),
-                timeout=10,
+                timeout=DEFAULT_TIMEOUT,
             )
 
             if response.status_code == 200:
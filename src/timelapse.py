@@ -3,16 +3,59 @@
 import os
 import sys
 import time
+import ctypes
 import shutil
-import signal
+import struct
+import threading
 from pathlib import Path
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 from .config import Config
 from .camera import Camera
 from .nas import NASMount
-from .printer import PrinterStatus
+from .printer import PrinterState, PrinterStatus
+
+# inotify event flags (linux/inotify.h) used to watch the manual control file
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _SafeNameChars(dict):
+    """str.translate table keeping alphanumerics and ._- and mapping the rest to _."""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        safe = char if char.isalnum() or char in "._-" else "_"
+        self[codepoint] = safe  # Cache so each character is only classified once
+        return safe
+
+
+SAFE_NAME_CHARS = _SafeNameChars()
+
+
+@dataclass
+class SessionState:
+    """Per-recording state tracked by the monitor loop."""
+
+    name: Optional[str] = None  # Session directory name, None when not recording
+    job_id: Optional[int] = None  # Printer job being recorded (None for manual sessions)
+    frame_count: int = 0
+    capture_success: int = 0
+    capture_failed: int = 0
+    finishing_mode: bool = False  # Faster capture when print is almost done
+    post_print_mode: bool = False  # Capturing extra frames after print finishes
+    post_print_frames_captured: int = 0
+    post_print_failed_attempts: int = 0
+    next_capture: float = 0.0  # time.monotonic() deadlines
+    next_post_print: float = 0.0
 
 
 class TimelapseManager:
@@ -21,6 +64,13 @@ class TimelapseManager:
     CONTROL_FILE = Path.home() / ".timelapse_recording"
     LOCAL_FALLBACK_DIR = Path.home() / "timelapse_local"
     MIN_FREE_DISK_MB = 2048  # Stop local captures if less than 2GB free
+    NAS_WRITE_BATCH = 16  # Max queued frames the NAS writer takes per wakeup
+    API_MAX_BACKOFF = 300  # Max seconds between polls while the printer API is down
+    NAS_FAILURE_THRESHOLD = 3  # Consecutive NAS write failures before pausing NAS writes
+    NAS_PROBE_INTERVAL = 15  # Seconds between NAS probes while writes are paused
+    STATUS_LOG_INTERVAL = 60  # Seconds between status lines when not on a terminal
+    NAS_COPY_TIMEOUT = 30  # Seconds before the NAS writer abandons a frame copy
+    STATUS_STALE_POLLS = 4  # check_intervals without a good poll before the status is unknown
 
     def __init__(self, config: Config):
         self.config = config
@@ -42,6 +92,47 @@ class TimelapseManager:
         )
         self._nas_available = True
         self._disk_full_warned = False
+        # Frames waiting to be copied to the NAS by the background writer.
+        # Bounded so a stalled NAS can't grow memory during a long print.
+        self._nas_queue: deque = deque(maxlen=config.nas_queue_max)
+        self._nas_queue_cond = threading.Condition()
+        self._nas_writer: Optional[threading.Thread] = None
+        self._nas_writer_stopping = False
+        self._last_drop_log = 0.0
+        # Circuit breaker: skip NAS writes for a while after repeated failures
+        self._nas_breaker_lock = threading.Lock()
+        self._nas_consecutive_fail = 0
+        self._nas_probe_deadline = 0.0
+        # Set to cut a monitor loop sleep short (e.g. manual control change)
+        self._wake = threading.Event()
+        # Manual session name cached by the inotify watcher (None = not watching)
+        self._control_lock = threading.Lock()
+        self._control_watched = False
+        self._manual_session: Optional[str] = None
+        # Control file mtime behind _manual_session when polling without inotify
+        self._control_mtime_ns: Optional[int] = None
+        # Frames directories of the session being recorded, resolved once at start
+        self._active_session: Optional[str] = None
+        self._active_frames_dir: Optional[Path] = None
+        self._active_nas_frames_dir: Optional[Path] = None
+        # printf-style frame path templates for the active session
+        self._frame_path_fmt = ""
+        self._nas_frame_path_fmt = ""
+        self._last_status_print = 0.0
+        self._last_status_line = ""
+        # On a terminal the status line is redrawn in place; under systemd
+        # "\r" lines pile up in one journal entry, so log whole lines sparingly
+        self._status_tty = sys.stdout.isatty()
+        self._status_min_interval = 1 if self._status_tty else self.STATUS_LOG_INTERVAL
+        # Last good printer status from the poller thread, numbered per
+        # successful poll and timestamped (monotonic); _status_ok is False
+        # while polls are failing
+        self._status_lock = threading.Lock()
+        self._latest_status: Optional[PrinterState] = None
+        self._status_seq = 0
+        self._status_time = 0.0
+        self._status_ok = True
+        self.session = SessionState()
 
     def _check_local_disk_space(self) -> bool:
         """Check if there's enough free space on the SD card for local frames.
@@ -59,12 +150,94 @@ class TimelapseManager:
         """Generate a session name from current timestamp."""
         return datetime.now().strftime("print_%Y%m%d_%H%M%S")
 
+    def _read_control_file(self) -> Optional[str]:
+        """Read the manual session name from the control file."""
+        try:
+            return self.CONTROL_FILE.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
     def _get_active_session(self) -> Optional[str]:
         """Get the currently active session name from control file."""
-        if self.CONTROL_FILE.exists():
-            name = self.CONTROL_FILE.read_text().strip()
-            return name if name else None
-        return None
+        if self._control_watched:
+            with self._control_lock:
+                return self._manual_session
+        return self._poll_control_file()
+
+    def _poll_control_file(self) -> Optional[str]:
+        """Re-read the control file only when its mtime has changed."""
+        try:
+            mtime_ns = os.stat(self.CONTROL_FILE).st_mtime_ns
+        except FileNotFoundError:
+            self._control_mtime_ns = None
+            return None
+        if mtime_ns != self._control_mtime_ns:
+            with self._control_lock:
+                self._manual_session = self._read_control_file()
+            self._control_mtime_ns = mtime_ns
+        return self._manual_session
+
+    def _start_control_watch(self) -> bool:
+        """
+        Watch the control file with inotify instead of polling it every loop.
+
+        The watcher thread keeps the cached manual session name current and
+        wakes the monitor loop when it changes, so manual start/stop takes
+        effect immediately. Falls back to polling if inotify isn't available.
+
+        Returns:
+            True if the watch was set up.
+        """
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return False
+            mask = IN_CREATE | IN_DELETE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            if libc.inotify_add_watch(fd, bytes(self.CONTROL_FILE.parent), mask) < 0:
+                os.close(fd)
+                return False
+        except (OSError, AttributeError):
+            return False
+
+        with self._control_lock:
+            self._manual_session = self._read_control_file()
+            self._control_watched = True
+        threading.Thread(target=self._control_watch_loop, args=(fd,), daemon=True).start()
+        return True
+
+    def _control_watch_loop(self, fd: int):
+        """Refresh the cached manual session on inotify events for the control file."""
+        target = os.fsencode(self.CONTROL_FILE.name)
+        while True:
+            try:
+                data = os.read(fd, 4096)
+            except OSError:
+                # Watch is broken, go back to polling the file
+                with self._control_lock:
+                    self._control_watched = False
+                return
+
+            changed = False
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if name == target:
+                    changed = True
+
+            if changed:
+                try:
+                    name = self._read_control_file()
+                except OSError:
+                    name = None
+                with self._control_lock:
+                    previous = self._manual_session
+                    self._manual_session = name
+                if name != previous:
+                    self._wake.set()
 
     def start_recording(self, name: Optional[str] = None, manual: bool = False) -> str:
         """
@@ -79,24 +252,51 @@ class TimelapseManager:
             Session name.
         """
         session_name = name or self._get_session_name()
+        self._prepare_session_dirs(session_name)
 
+        # Only write control file for manual sessions
+        # Auto sessions rely on printer status - control file would cause infinite recording
+        if manual:
+            self.CONTROL_FILE.write_text(session_name)
+        return session_name
+
+    def _prepare_session_dirs(self, session_name: str) -> Path:
+        """
+        Create the session's frames directories and cache them for capture_frame.
+
+        Returns:
+            Local frames directory.
+        """
         # Always create local session directory (primary storage)
         local_dir = self.LOCAL_FALLBACK_DIR / session_name / "frames"
         local_dir.mkdir(parents=True, exist_ok=True)
 
         # Also create NAS directory if available (sync target)
+        nas_dir = self.storage_path / session_name / "frames"
         if self._nas_available:
             try:
-                nas_dir = self.storage_path / session_name / "frames"
                 nas_dir.mkdir(parents=True, exist_ok=True)
             except OSError:
                 pass  # NAS unavailable, frames safe locally
 
-        # Only write control file for manual sessions
-        # Auto sessions rely on printer status - control file would cause infinite recording
-        if manual:
-            self.CONTROL_FILE.write_text(session_name)
-        return session_name
+        self._active_session = session_name
+        self._active_frames_dir = local_dir
+        self._active_nas_frames_dir = nas_dir
+        self._frame_path_fmt = str(local_dir / "frame_%06d.jpg")
+        self._nas_frame_path_fmt = str(nas_dir / "frame_%06d.jpg")
+        return local_dir
+
+    def _clear_session_dirs(self):
+        """Forget the cached frames directories once a session ends."""
+        self._active_session = None
+        self._active_frames_dir = None
+        self._active_nas_frames_dir = None
+
+    def _reset_session_state(self) -> SessionState:
+        """Start from a blank SessionState and forget the session's directories."""
+        self.session = SessionState()
+        self._clear_session_dirs()
+        return self.session
 
     def stop_recording(self) -> Optional[str]:
         """
@@ -105,11 +305,11 @@ class TimelapseManager:
         Returns:
             Session name that was stopped, or None if not recording.
         """
-        if not self.CONTROL_FILE.exists():
+        try:
+            session_name = self.CONTROL_FILE.read_text().strip()
+            self.CONTROL_FILE.unlink()
+        except FileNotFoundError:
             return None
-
-        session_name = self.CONTROL_FILE.read_text().strip()
-        self.CONTROL_FILE.unlink()
         return session_name
 
     def is_recording(self) -> bool:
@@ -126,42 +326,376 @@ class TimelapseManager:
             timeout: Timeout in seconds (default 30)
 
         Returns:
-            True if copy succeeded within timeout.
+            True if copy succeeded within timeout. Fails immediately while
+            the NAS circuit breaker is open.
         """
-        def timeout_handler(signum, frame):
-            raise TimeoutError("File copy timed out")
+        if self._nas_breaker_open():
+            return False
 
-        old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(timeout)
         try:
-            shutil.copy2(src, dst)
-            return True
+            self._call_with_timeout(timeout, self._copy_atomic, src, dst)
         except TimeoutError:
             print(f"\nWarning: NAS transfer timed out for {dst.name}")
+            self._record_nas_result(False)
             return False
         except Exception as e:
             print(f"\nWarning: NAS transfer failed: {e}")
+            self._record_nas_result(False)
             return False
+        self._record_nas_result(True)
+        return True
+
+    @staticmethod
+    def _call_with_timeout(timeout: float, func, *args):
+        """
+        Run func(*args) on a daemon thread and return its result.
+
+        Works from any thread, unlike SIGALRM. A call stuck on a hung mount
+        can't be interrupted: after timeout it is abandoned and TimeoutError
+        is raised, and being a daemon thread it can't block shutdown.
+        """
+        outcome = []
+
+        def _run():
+            try:
+                outcome.append((True, func(*args)))
+            except BaseException as e:
+                outcome.append((False, e))
+
+        worker = threading.Thread(target=_run, name="nas-io", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if not outcome:
+            raise TimeoutError(f"NAS operation timed out after {timeout}s")
+        ok, value = outcome[0]
+        if not ok:
+            raise value
+        return value
+
+    def _nas_breaker_open(self) -> bool:
+        """Check whether NAS writes are paused after repeated failures."""
+        with self._nas_breaker_lock:
+            return (
+                self._nas_consecutive_fail >= self.NAS_FAILURE_THRESHOLD
+                and time.monotonic() < self._nas_probe_deadline
+            )
+
+    def _record_nas_result(self, ok: bool):
+        """Update the NAS circuit breaker after a write attempt."""
+        with self._nas_breaker_lock:
+            if ok:
+                self._nas_consecutive_fail = 0
+                return
+            self._nas_consecutive_fail += 1
+            tripped = self._nas_consecutive_fail == self.NAS_FAILURE_THRESHOLD
+            if self._nas_consecutive_fail >= self.NAS_FAILURE_THRESHOLD:
+                self._nas_probe_deadline = time.monotonic() + self.NAS_PROBE_INTERVAL
+        if tripped:
+            print("\nNAS writes failing — pausing NAS sync, frames safe locally")
+
+    def _probe_nas(self) -> bool:
+        """
+        Cheap NAS check once the breaker's probe deadline has passed.
+
+        Only called from the NAS writer thread; on a hung mount it gives up
+        after NAS_COPY_TIMEOUT.
+        """
+        try:
+            self._call_with_timeout(self.NAS_COPY_TIMEOUT, os.statvfs, str(self.storage_path))
+        except OSError:
+            self._record_nas_result(False)
+            return False
+        self._record_nas_result(True)
+        return True
+
+    def _print_status(self, line: str):
+        """
+        Show a status line when it changes.
+
+        Rate-limited to once per second on a terminal, where the line is
+        overwritten in place, and once per STATUS_LOG_INTERVAL otherwise.
+        """
+        now = time.monotonic()
+        if line != self._last_status_line and now - self._last_status_print >= self._status_min_interval:
+            if self._status_tty:
+                print(line, end="\r", flush=True)
+            else:
+                print(line)
+            self._last_status_print = now
+            self._last_status_line = line
+
+    def _end_session(self, summary: str) -> SessionState:
+        """
+        Report a finished session, mark it ready for video and reset state.
+
+        The summary and capture rate go out as one write so journald gets
+        a single entry per finished session.
+
+        Returns:
+            The fresh SessionState.
+        """
+        s = self.session
+        lines = [f"\n{summary}"]
+        total = s.capture_success + s.capture_failed
+        if total > 0:
+            rate = s.capture_success / total * 100
+            lines.append(f"Session capture rate: {rate:.1f}% ({s.capture_success}/{total})")
+        print("\n".join(lines))
+        self._signal_session_complete(s.name)
+        return self._reset_session_state()
+
+    @staticmethod
+    def _advance_deadline(deadline: float, interval: float, now: float) -> float:
+        """
+        Move a capture deadline one interval forward on its fixed grid.
+
+        Work done between wake-ups no longer pushes the schedule later. If
+        the loop fell more than a full interval behind (or hasn't captured
+        yet), the grid restarts from now instead of bursting catch-up frames.
+        """
+        deadline += interval
+        if deadline <= now:
+            deadline = now + interval
+        return deadline
+
+    def _wait(self, timeout: float):
+        """Sleep up to timeout seconds, returning early if the monitor is woken."""
+        if self._wake.wait(max(timeout, 0)):
+            self._wake.clear()
+
+    def _start_status_poller(self, check_interval: int):
+        """
+        Poll the printer from a background thread.
+
+        A slow or unreachable PrusaLink API then only delays status updates,
+        never frame capture. The first poll runs synchronously so the monitor
+        loop starts with a status.
+        """
+        self._poll_status()
+        threading.Thread(target=self._status_poll_loop, args=(check_interval,), daemon=True).start()
+
+    def _poll_status(self) -> Optional[PrinterState]:
+        """
+        Fetch printer status, publish it and wake the monitor loop.
+
+        A failed poll keeps the last good status and only marks the API as
+        unreachable, so a short outage doesn't interrupt captures.
+        """
+        try:
+            status = self.printer.get_status()
+        except Exception as e:
+            # e.g. a malformed payload; a dead poller would freeze the status
+            print(f"\nWarning: Printer status poll failed: {e}")
+            status = None
+        with self._status_lock:
+            if status is not None:
+                self._latest_status = status
+                self._status_seq += 1
+                self._status_time = time.monotonic()
+            self._status_ok = status is not None
+        self._wake.set()
+        return status
+
+    def _status_poll_loop(self, check_interval: int):
+        """Poll every check_interval, backing off exponentially while the API is down."""
+        api_backoff = check_interval
+        while True:
+            time.sleep(api_backoff)
+            # While recording, keep retrying at check_interval so the session
+            # follows the printer again as soon as it's back
+            if self._poll_status() is None and self.session.name is None:
+                api_backoff = min(api_backoff * 2, self.API_MAX_BACKOFF)
+            else:
+                api_backoff = check_interval
+
+    def _get_latest_status(self) -> tuple[Optional[PrinterState], int, bool, float]:
+        """
+        Get the last good printer status.
+
+        Returns:
+            Tuple of (status, poll sequence number, whether the last poll
+            succeeded, seconds since the status was fetched).
+        """
+        with self._status_lock:
+            age = time.monotonic() - self._status_time
+            return self._latest_status, self._status_seq, self._status_ok, age
+
+    def _start_nas_writer(self):
+        """Start the background thread that copies captured frames to the NAS."""
+        if self._nas_writer is not None and self._nas_writer.is_alive():
+            return
+        self._nas_writer = threading.Thread(target=self._nas_writer_loop, daemon=True)
+        self._nas_writer.start()
+
+    def _stop_nas_writer(self, timeout: float = 10):
+        """
+        Let the NAS writer drain the queue and exit, waiting at most timeout.
+
+        Frames still queued after the timeout are safe locally and get
+        synced on the next start.
+        """
+        if self._nas_writer is None or not self._nas_writer.is_alive():
+            return
+        with self._nas_queue_cond:
+            pending = len(self._nas_queue)
+            self._nas_writer_stopping = True
+            self._nas_queue_cond.notify()
+        if pending:
+            print(f"Flushing {pending} queued frames to NAS...")
+        self._nas_writer.join(timeout)
+        self._nas_writer = None
+
+    def _queue_nas_copy(self, src: str, dst: str):
+        """
+        Queue a local frame for copying to the NAS.
+
+        If the queue is full (slow or stalled NAS), the oldest pending copy
+        is dropped so capture never blocks. Dropped frames are still safe
+        locally and get synced later with the rest of the session.
+        """
+        with self._nas_queue_cond:
+            dropped = None
+            if len(self._nas_queue) == self._nas_queue.maxlen:
+                dropped = self._nas_queue[0][0]  # Evicted by append below
+            self._nas_queue.append((src, dst))
+            self._nas_queue_cond.notify()
+
+        if dropped is not None:
+            now = time.monotonic()
+            if now - self._last_drop_log >= 1:
+                print(f"\nNAS backpressure: dropped frame {os.path.basename(dropped)}")
+                self._last_drop_log = now
+
+    def _nas_writer_loop(self):
+        """
+        Drain queued frames to the NAS.
+
+        Runs off the main thread, so the capture loop keeps its cadence. A
+        copy still stuck on a hung NAS after NAS_COPY_TIMEOUT is abandoned
+        and counted as a failure. After NAS_FAILURE_THRESHOLD consecutive
+        failures, queued frames are skipped until a probe succeeds; skipped
+        frames stay local and are synced with the finished session.
+        """
+        # Session frames directory on the NAS, opened once and reused so each
+        # frame is created relative to it instead of re-walking the mount path
+        dir_path = None
+        dir_fd = None
+        while True:
+            with self._nas_queue_cond:
+                while not self._nas_queue and not self._nas_writer_stopping:
+                    self._nas_queue_cond.wait()
+                if not self._nas_queue:
+                    # Stopping and fully drained
+                    self._nas_writer_stopping = False
+                    break
+                # Take everything pending (up to a batch) in one lock round-trip
+                batch = []
+                while self._nas_queue and len(batch) < self.NAS_WRITE_BATCH:
+                    batch.append(self._nas_queue.popleft())
+
+            if not self._nas_available or self._nas_breaker_open():
+                continue  # Frames are safe locally, synced when NAS returns
+
+            with self._nas_breaker_lock:
+                half_open = self._nas_consecutive_fail >= self.NAS_FAILURE_THRESHOLD
+            if half_open and not self._probe_nas():
+                continue
+
+            for src, dst in batch:
+                try:
+                    dst_dir, name = os.path.split(dst)
+                    if dst_dir != dir_path:
+                        if dir_fd is not None:
+                            os.close(dir_fd)
+                            dir_path, dir_fd = None, None
+                        dir_fd = self._call_with_timeout(self.NAS_COPY_TIMEOUT, self._open_nas_dir, dst_dir)
+                        dir_path = dst_dir
+                    self._call_with_timeout(self.NAS_COPY_TIMEOUT, self._copy_into_dir, src, dir_fd, name)
+                    self._record_nas_result(True)
+                except TimeoutError:
+                    self._record_nas_result(False)
+                    # The abandoned call may still be using dir_fd: leave it
+                    # open rather than let the number be reused under it
+                    dir_path, dir_fd = None, None
+                    break
+                except OSError:
+                    self._record_nas_result(False)
+                    # Reopen the directory after the NAS comes back
+                    if dir_fd is not None:
+                        try:
+                            os.close(dir_fd)
+                        except OSError:
+                            pass
+                    dir_path, dir_fd = None, None
+                    break
+
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    @staticmethod
+    def _copy_atomic(src: Path, dst: Path):
+        """copy2 to a temp name, then rename, so dst is never a partial frame."""
+        tmp = dst.with_name(dst.name + ".tmp")
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+
+    @staticmethod
+    def _open_nas_dir(path: str) -> int:
+        """Create a session frames directory on the NAS if needed and open it."""
+        os.makedirs(path, exist_ok=True)
+        return os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+
+    @staticmethod
+    def _copy_into_dir(src: str, dir_fd: int, name: str):
+        """
+        Copy src to name inside an already-open directory.
+
+        Bytes move in-kernel with os.sendfile into a temp name that is
+        renamed into place, so the NAS never holds a partial frame under
+        its real name. On error the temp file is removed. The source
+        mtime is kept, like copy2.
+        """
+        tmp_name = name + ".tmp"
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            st = os.fstat(src_fd)
+            dst_fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+            try:
+                offset = 0
+                while offset < st.st_size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, st.st_size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                os.utime(dst_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+                os.close(dst_fd)
+                dst_fd = None
+                os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            except OSError:
+                if dst_fd is not None:
+                    os.close(dst_fd)
+                try:
+                    os.unlink(tmp_name, dir_fd=dir_fd)
+                except OSError:
+                    pass
+                raise
         finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
+            os.close(src_fd)
 
     def _signal_session_complete(self, session_name: str):
         """Signal that session is ready for video processing."""
         # Always mark locally first (primary storage)
         try:
-            local_session = self.LOCAL_FALLBACK_DIR / session_name
-            if local_session.exists():
-                (local_session / "ready_for_video").touch()
+            (self.LOCAL_FALLBACK_DIR / session_name / "ready_for_video").touch()
+        except FileNotFoundError:
+            pass  # Session never captured a frame
         except Exception as e:
             print(f"Warning: Could not create local ready marker: {e}")
 
         # Also mark on NAS if available (sync target)
         if self._nas_available:
             try:
-                nas_session = self.storage_path / session_name
-                if nas_session.exists():
-                    (nas_session / "ready_for_video").touch()
+                (self.storage_path / session_name / "ready_for_video").touch()
             except OSError:
                 pass  # NAS unavailable, marker safe locally
 
@@ -174,9 +708,6 @@ class TimelapseManager:
         the session is fully processed and synced to NAS. This ensures
         zero data loss even if NAS goes down during or after sync.
         """
-        if not self.LOCAL_FALLBACK_DIR.exists():
-            return
-
         try:
             sessions = [d for d in self.LOCAL_FALLBACK_DIR.iterdir() if d.is_dir()]
         except Exception:
@@ -188,9 +719,7 @@ class TimelapseManager:
         total_synced = 0
         for session_dir in sessions:
             frames_dir = session_dir / "frames"
-            if not frames_dir.exists():
-                continue
-            frames = sorted(frames_dir.glob("frame_*.jpg"))
+            frames = sorted(frames_dir.glob("frame_*.jpg"))  # Empty if no frames dir
             if not frames:
                 continue
 
@@ -199,6 +728,8 @@ class TimelapseManager:
 
             try:
                 nas_frames_dir.mkdir(parents=True, exist_ok=True)
+                # One directory listing instead of a stat round-trip per frame
+                on_nas = set(os.listdir(nas_frames_dir))
             except OSError:
                 print(f"NAS unavailable during sync — will retry later")
                 self._nas_available = False
@@ -206,14 +737,10 @@ class TimelapseManager:
 
             synced = 0
             for frame in frames:
-                nas_frame = nas_frames_dir / frame.name
                 # Skip frames already on NAS
-                try:
-                    if nas_frame.exists():
-                        continue
-                except OSError:
-                    self._nas_available = False
-                    return
+                if frame.name in on_nas:
+                    continue
+                nas_frame = nas_frames_dir / frame.name
 
                 if not self._copy_with_timeout(frame, nas_frame, timeout=30):
                     print(f"NAS sync stalled at {synced} frames — will retry later")
@@ -252,11 +779,6 @@ class TimelapseManager:
         Returns:
             True if capture successful.
         """
-        # Capture to temp location first
-        snapshot = self.camera.capture()
-        if not snapshot:
-            return False
-
         # Always save locally first (primary storage)
         if not self._check_local_disk_space():
             if not self._disk_full_warned:
@@ -267,29 +789,32 @@ class TimelapseManager:
         if self._disk_full_warned:
             self._disk_full_warned = False
 
-        local_frames_dir = self.LOCAL_FALLBACK_DIR / session_name / "frames"
         try:
-            local_frames_dir.mkdir(parents=True, exist_ok=True)
-            frame_path = local_frames_dir / f"frame_{frame_number:06d}.jpg"
-            shutil.copy2(snapshot, frame_path)
+            if session_name != self._active_session:
+                self._prepare_session_dirs(session_name)
         except Exception as e:
             print(f"\nLocal save failed: {e}")
             return False
 
-        # Best-effort NAS sync (frame is already safe locally)
-        if self._nas_available:
+        # Capture straight into the local frames directory, under a temp name
+        # renamed into place so the encoder never sees a partial frame
+        frame_path = self._frame_path_fmt % frame_number
+        tmp_path = frame_path + ".tmp"
+        if not self.camera.capture(Path(tmp_path)):
             try:
-                nas_frames_dir = self.storage_path / session_name / "frames"
-                if not nas_frames_dir.exists():
-                    nas_frames_dir.mkdir(parents=True, exist_ok=True)
-                nas_frame = nas_frames_dir / f"frame_{frame_number:06d}.jpg"
-                if not self._copy_with_timeout(frame_path, nas_frame, timeout=10):
-                    if self._nas_available:
-                        self._nas_available = False
+                os.unlink(tmp_path)
             except OSError:
-                if self._nas_available:
-                    print(f"\nNAS sync failed — frames safe locally")
-                    self._nas_available = False
+                pass
+            return False
+        try:
+            os.replace(tmp_path, frame_path)
+        except OSError as e:
+            print(f"\nLocal save failed: {e}")
+            return False
+
+        # Best-effort NAS sync in the background (frame is already safe locally)
+        if self._nas_available:
+            self._queue_nas_copy(frame_path, self._nas_frame_path_fmt % frame_number)
 
         return True
 
@@ -322,39 +847,37 @@ class TimelapseManager:
             print("NAS: unavailable — frames safe locally, will sync when NAS returns")
         print()
 
-        current_session = None
-        current_job_id = None
-        frame_count = 0
-        last_capture = 0
+        self._start_nas_writer()
+        self._start_control_watch()
+        self._start_status_poller(check_interval)
+
+        s = self._reset_session_state()
 
         # Resilience: debounce printer status to avoid false stops
         not_printing_count = 0
+        last_status_seq = 0
+        api_was_ok = True
+        status_stale = False
+        # How long a failing API may leave the last good status in charge
+        status_max_age = check_interval * self.STATUS_STALE_POLLS
         STOP_THRESHOLD = 3  # Require 3 consecutive "not printing" to stop
 
-        # Finishing mode: faster capture when print is almost done
-        finishing_mode = False
-
-        # Post-print capture: capture extra frames after print finishes
-        post_print_mode = False
-        post_print_frames_captured = 0
-        post_print_last_capture = 0
-        post_print_failed_attempts = 0
         POST_PRINT_MAX_FAILURES = 10  # Give up after this many consecutive failures
 
-        # Resilience: track capture metrics
-        capture_success = 0
-        capture_failed = 0
-
         # NAS health check interval (check every 5 minutes, not every loop)
-        last_nas_check = 0
+        next_nas_check = 0.0
         NAS_CHECK_INTERVAL = 300
 
+        # Back off on repeated unexpected errors instead of a fixed minute
+        error_backoff = check_interval
+        MAX_ERROR_BACKOFF = check_interval * 8
+
         while True:
             try:
                 # Periodic NAS health check and recovery
-                now_check = time.time()
-                if now_check - last_nas_check >= NAS_CHECK_INTERVAL:
-                    last_nas_check = now_check
+                now_check = time.monotonic()
+                if now_check >= next_nas_check:
+                    next_nas_check = now_check + NAS_CHECK_INTERVAL
                     was_unavailable = not self._nas_available
                     self._nas_available = self.nas.is_healthy()
 
@@ -371,13 +894,30 @@ class TimelapseManager:
                 # Check for manual override
                 manual_session = self._get_active_session()
 
-                # Check printer status
-                status = self.printer.get_status()
-
-                # Resilience: handle API failures gracefully
+                # Latest printer status (polled in the background)
+                status, status_seq, api_ok, status_age = self._get_latest_status()
+                fresh_status = status_seq != last_status_seq
+                last_status_seq = status_seq
+
+                # Resilience: ride out short API failures on the last good
+                # status, but stop trusting it (and capturing) once it's stale,
+                # e.g. the printer was switched off mid-print
+                if api_ok != api_was_ok:
+                    if api_ok:
+                        print("\nPrinter API reachable again")
+                    elif status is not None:
+                        print(f"\nWarning: Printer API unreachable — continuing on last known status for up to {status_max_age:.0f}s")
+                    api_was_ok = api_ok
+                if status is not None and not api_ok and status_age > status_max_age:
+                    if not status_stale:
+                        print(f"\nWarning: Printer API unreachable for {status_age:.0f}s — capture paused until it's back")
+                        status_stale = True
+                    self._wait(check_interval)
+                    continue
+                status_stale = False
                 if status is None:
-                    print("Warning: Printer API unreachable", end="\r", flush=True)
-                    time.sleep(check_interval)
+                    self._print_status("Warning: Printer API unreachable")
+                    self._wait(check_interval)
                     continue
 
                 is_printing = status.is_printing
@@ -392,204 +932,151 @@ class TimelapseManager:
 
                 # Resilience: debounce stop decision (only when job becomes inactive, not just paused)
                 # Skip debounce if in finishing mode - we're confident the print is ending
-                if not should_keep_session and current_session and not manual_session and not finishing_mode:
-                    not_printing_count += 1
+                if not should_keep_session and s.name and not manual_session and not s.finishing_mode:
+                    if fresh_status:
+                        not_printing_count += 1
                     if not_printing_count < STOP_THRESHOLD:
-                        # Don't stop yet - job might just be in transition
-                        time.sleep(min(check_interval, self.config.capture_interval))
+                        # Don't stop yet - job might just be in transition.
+                        # Only a new poll can change the count, and the poller wakes us.
+                        self._wait(check_interval)
                         continue
                 else:
                     not_printing_count = 0
 
                 # Detect job ID change (new print started while already recording)
-                if current_session and current_job_id and job_id and job_id != current_job_id:
-                    print(f"\nJob changed ({current_job_id} -> {job_id}), finalizing previous session...")
-                    print(f"Session stopped: {current_session}")
+                if s.name and s.job_id and job_id and job_id != s.job_id:
+                    print(f"\nJob changed ({s.job_id} -> {job_id}), finalizing previous session...")
+                    print(f"Session stopped: {s.name}")
                     # Reset all state for new recording immediately
-                    current_session = None
-                    current_job_id = None
-                    frame_count = 0
-                    finishing_mode = False
-                    post_print_mode = False
-                    post_print_frames_captured = 0
-                    post_print_failed_attempts = 0
+                    s = self._reset_session_state()
 
                 # Handle state transitions
-                if should_keep_session and current_session is None:
+                if should_keep_session and s.name is None:
                     # Start recording
                     if manual_session:
-                        current_session = manual_session
-                        current_job_id = None  # Manual recordings don't track job ID
-                        # Always create local session directory (primary storage)
-                        local_dir = self.LOCAL_FALLBACK_DIR / current_session / "frames"
-                        local_dir.mkdir(parents=True, exist_ok=True)
-                        # Also create NAS directory if available
-                        if self._nas_available:
-                            try:
-                                nas_dir = self.storage_path / current_session / "frames"
-                                nas_dir.mkdir(parents=True, exist_ok=True)
-                            except OSError:
-                                pass
-                        print(f"Recording started (manual): {current_session}")
+                        s.name = manual_session
+                        s.job_id = None  # Manual recordings don't track job ID
+                        self._prepare_session_dirs(s.name)
+                        print(f"Recording started (manual): {s.name}")
                     else:
                         job_name = status.job_name if status else None
                         if job_name:
                             # Clean job name for filename
-                            safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in job_name)
-                            current_session = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{safe_name}"
+                            safe_name = job_name.translate(SAFE_NAME_CHARS)
+                            s.name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{safe_name}"
                         else:
-                            current_session = self._get_session_name()
-                        current_job_id = job_id  # Track job ID for this recording
-                        self.start_recording(current_session)
-                        print(f"Recording started (auto, job {job_id}): {current_session}")
-
-                    frame_count = 0
-                    last_capture = 0
-                    # Reset finishing and post-print state when new session starts
-                    finishing_mode = False
-                    post_print_mode = False
-                    post_print_frames_captured = 0
-                    post_print_failed_attempts = 0
-
-                elif not should_keep_session and current_session is not None and not post_print_mode:
+                            s.name = self._get_session_name()
+                        s.job_id = job_id  # Track job ID for this recording
+                        self.start_recording(s.name)
+                        print(f"Recording started (auto, job {job_id}): {s.name}")
+
+                elif not should_keep_session and s.name is not None and not s.post_print_mode:
                     # Enter post-print capture mode instead of stopping immediately
                     if self.config.post_print_frames > 0:
-                        post_print_mode = True
-                        post_print_frames_captured = 0
-                        post_print_last_capture = 0
-                        post_print_failed_attempts = 0
+                        s.post_print_mode = True
                         print(f"\nPrint finished. Capturing {self.config.post_print_frames} post-print frames...")
                     else:
                         # No post-print frames configured, stop immediately
-                        print(f"\nRecording stopped: {current_session}")
-                        total = capture_success + capture_failed
-                        if total > 0:
-                            rate = capture_success / total * 100
-                            print(f"Session capture rate: {rate:.1f}% ({capture_success}/{total})")
-                        self._signal_session_complete(current_session)
-                        current_session = None
-                        current_job_id = None
-                        frame_count = 0
-                        capture_success = 0
-                        capture_failed = 0
-                        finishing_mode = False
+                        s = self._end_session(f"Recording stopped: {s.name}")
 
                 # Handle post-print frame capture
-                if post_print_mode and current_session:
+                if s.post_print_mode and s.name:
                     # Check if manual session was created - cancel post-print and switch to manual
-                    if manual_session and manual_session != current_session:
+                    if manual_session and manual_session != s.name:
                         print(f"\nManual session requested, canceling post-print capture...")
-                        print(f"Post-print capture stopped early: {current_session} ({post_print_frames_captured} frames)")
-                        current_session = None
-                        finishing_mode = False
-                        post_print_mode = False
-                        post_print_frames_captured = 0
-                        post_print_failed_attempts = 0
-                        # Will pick up manual session on next iteration
-                        time.sleep(1)
+                        print(f"Post-print capture stopped early: {s.name} ({s.post_print_frames_captured} frames)")
+                        s = self._reset_session_state()
+                        # Pick up the manual session on the next pass, right away
                         continue
 
-                    now = time.time()
-                    if now - post_print_last_capture >= self.config.post_print_interval:
-                        if self.capture_frame(current_session, frame_count):
-                            frame_count += 1
-                            post_print_frames_captured += 1
-                            capture_success += 1
-                            post_print_failed_attempts = 0  # Reset on success
-                            remaining = self.config.post_print_frames - post_print_frames_captured
-                            print(f"Post-print frame {post_print_frames_captured}/{self.config.post_print_frames} captured ({remaining} remaining)", end="\r", flush=True)
+                    now = time.monotonic()
+                    if now >= s.next_post_print:
+                        if self.capture_frame(s.name, s.frame_count):
+                            s.frame_count += 1
+                            s.post_print_frames_captured += 1
+                            s.capture_success += 1
+                            s.post_print_failed_attempts = 0  # Reset on success
+                            remaining = self.config.post_print_frames - s.post_print_frames_captured
+                            self._print_status(f"Post-print frame {s.post_print_frames_captured}/{self.config.post_print_frames} captured ({remaining} remaining)")
                         else:
-                            capture_failed += 1
-                            post_print_failed_attempts += 1
+                            s.capture_failed += 1
+                            s.post_print_failed_attempts += 1
                             # Check if we've exceeded max failures
-                            if post_print_failed_attempts >= POST_PRINT_MAX_FAILURES:
-                                print(f"\nPost-print capture aborted: {POST_PRINT_MAX_FAILURES} consecutive failures")
-                                print(f"Session stopped: {current_session} ({post_print_frames_captured}/{self.config.post_print_frames} post-print frames)")
-                                self._signal_session_complete(current_session)
-                                current_session = None
-                                current_job_id = None
-                                frame_count = 0
-                                capture_success = 0
-                                capture_failed = 0
-                                finishing_mode = False
-                                post_print_mode = False
-                                post_print_frames_captured = 0
-                                post_print_failed_attempts = 0
+                            if s.post_print_failed_attempts >= POST_PRINT_MAX_FAILURES:
+                                s = self._end_session(
+                                    f"Post-print capture aborted: {POST_PRINT_MAX_FAILURES} consecutive failures\n"
+                                    f"Session stopped: {s.name} ({s.post_print_frames_captured}/{self.config.post_print_frames} post-print frames)"
+                                )
                                 continue
-                        post_print_last_capture = now
+                        s.next_post_print = self._advance_deadline(s.next_post_print, self.config.post_print_interval, time.monotonic())
 
                         # Check if we've captured all post-print frames
-                        if post_print_frames_captured >= self.config.post_print_frames:
-                            print(f"\nPost-print capture complete. Recording stopped: {current_session}")
-                            total = capture_success + capture_failed
-                            if total > 0:
-                                rate = capture_success / total * 100
-                                print(f"Session capture rate: {rate:.1f}% ({capture_success}/{total})")
-                            self._signal_session_complete(current_session)
-                            current_session = None
-                            current_job_id = None
-                            frame_count = 0
-                            capture_success = 0
-                            capture_failed = 0
-                            finishing_mode = False
-                            post_print_mode = False
-                            post_print_frames_captured = 0
-                            post_print_failed_attempts = 0
+                        if s.post_print_frames_captured >= self.config.post_print_frames:
+                            s = self._end_session(f"Post-print capture complete. Recording stopped: {s.name}")
 
                 # Capture frames only when actively printing (not during pause/filament change or post-print)
-                if current_session and should_capture and not post_print_mode:
+                if s.name and should_capture and not s.post_print_mode:
                     # Check if we've entered finishing mode (progress >= threshold)
                     progress = status.progress if status.progress is not None else 0
-                    was_finishing = finishing_mode
-                    finishing_mode = progress >= self.config.finishing_threshold
+                    was_finishing = s.finishing_mode
+                    s.finishing_mode = progress >= self.config.finishing_threshold
 
                     # Announce entering finishing mode
-                    if finishing_mode and not was_finishing:
+                    if s.finishing_mode and not was_finishing:
                         print(f"\nFinishing mode: {progress:.1f}% - capturing every {self.config.finishing_interval}s")
+                        # Switch to the faster cadence now rather than after the pending slow interval
+                        s.next_capture = 0.0
 
                     # Use faster interval in finishing mode
-                    current_interval = self.config.finishing_interval if finishing_mode else self.config.capture_interval
-
-                    now = time.time()
-                    if now - last_capture >= current_interval:
-                        if self.capture_frame(current_session, frame_count):
-                            frame_count += 1
-                            capture_success += 1
-                            if finishing_mode:
-                                print(f"Frame {frame_count} captured ({progress:.1f}% - finishing)", end="\r", flush=True)
+                    current_interval = self.config.finishing_interval if s.finishing_mode else self.config.capture_interval
+
+                    now = time.monotonic()
+                    if now >= s.next_capture:
+                        if self.capture_frame(s.name, s.frame_count):
+                            s.frame_count += 1
+                            s.capture_success += 1
+                            if s.finishing_mode:
+                                self._print_status(f"Frame {s.frame_count} captured ({progress:.1f}% - finishing)")
                             else:
-                                print(f"Frame {frame_count} captured ({progress:.1f}%)", end="\r", flush=True)
+                                self._print_status(f"Frame {s.frame_count} captured ({progress:.1f}%)")
                         else:
-                            capture_failed += 1
-                        last_capture = now
+                            s.capture_failed += 1
+                        s.next_capture = self._advance_deadline(s.next_capture, current_interval, time.monotonic())
 
                         # Resilience: log capture rate every 100 attempts
-                        total = capture_success + capture_failed
+                        total = s.capture_success + s.capture_failed
                         if total > 0 and total % 100 == 0:
-                            rate = capture_success / total * 100
-                            print(f"\nCapture rate: {rate:.1f}% ({capture_success}/{total})")
-                elif current_session and not should_capture and not post_print_mode:
+                            rate = s.capture_success / total * 100
+                            print(f"\nCapture rate: {rate:.1f}% ({s.capture_success}/{total}), NAS queue: {len(self._nas_queue)}")
+                elif s.name and not should_capture and not s.post_print_mode:
                     # Session active but paused - show status without capturing
-                    print(f"Session active, paused ({status.state_text}) - {frame_count} frames", end="\r", flush=True)
-
-                # Use shorter sleep when in finishing mode or post-print mode
-                if post_print_mode:
-                    sleep_interval = min(check_interval, self.config.post_print_interval)
-                elif finishing_mode:
-                    sleep_interval = min(check_interval, self.config.finishing_interval)
-                else:
+                    self._print_status(f"Session active, paused ({status.state_text}) - {s.frame_count} frames")
+
+                # Sleep until the next frame is due while capturing, otherwise
+                # poll at check_interval. _wake cuts the sleep short.
+                now = time.monotonic()
+                if s.post_print_mode:
+                    sleep_interval = s.next_post_print - now
+                elif s.name and should_capture:
+                    sleep_interval = s.next_capture - now
+                elif s.name:
                     sleep_interval = min(check_interval, self.config.capture_interval)
-                time.sleep(sleep_interval)
+                else:
+                    sleep_interval = check_interval
+                error_backoff = check_interval
+                self._wait(min(sleep_interval, check_interval))
 
             except KeyboardInterrupt:
                 print("\n\nStopping monitor...")
-                if current_session:
-                    print(f"Finalizing session: {current_session}...")
+                if s.name:
+                    print(f"Finalizing session: {s.name}...")
                     self.stop_recording()
+                self._stop_nas_writer()
                 break
             except Exception as e:
-                print(f"\nError: {e}")
-                time.sleep(60)
+                print(f"\nError: {e} (retrying in {error_backoff}s)")
+                time.sleep(error_backoff)
+                error_backoff = min(error_backoff * 2, MAX_ERROR_BACKOFF)
 
 
 def main():
@@ -3,6 +3,8 @@
 import requests
 from pathlib import Path
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class PrusaConnectUploader:
@@ -20,6 +22,28 @@ class PrusaConnectUploader:
         """
         self.camera_token = camera_token
         self.fingerprint = fingerprint if len(fingerprint) >= 16 else fingerprint + "0" * (16 - len(fingerprint))
+        # Keep the TLS connection to Prusa Connect alive between uploads and
+        # retry briefly when its edge is momentarily unavailable
+        self._session = requests.Session()
+        # Only retry 5xx answers: a timed-out upload re-sent twice more would
+        # hold up the service loop for minutes on a single snapshot
+        retry = Retry(total=2, connect=0, read=False, status=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry))
+        self._session.headers.update({
+            "Content-Type": "image/jpg",
+            "Token": self.camera_token,
+            "Fingerprint": self.fingerprint,
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the pooled connection to Prusa Connect."""
+        self._session.close()
 
     def upload(self, image_path: Path, timeout: int = 30) -> tuple[bool, Optional[str]]:
         """
@@ -35,18 +59,13 @@ class PrusaConnectUploader:
         if not image_path.exists():
             return False, "Image file not found"
 
-        headers = {
-            "Content-Type": "image/jpg",
-            "Token": self.camera_token,
-            "Fingerprint": self.fingerprint,
-        }
-
         try:
+            # Stream the file rather than reading it into memory first;
+            # requests takes the Content-Length from the open file's size
             with open(image_path, "rb") as f:
-                response = requests.put(
+                response = self._session.put(
                     self.UPLOAD_URL,
-                    headers=headers,
-                    data=f.read(),
+                    data=f,
                     timeout=timeout,
                 )
             if response.status_code in (200, 204):
@@ -72,14 +91,8 @@ class PrusaConnectUploader:
             Tuple of (success, error_message)
         """
         try:
-            headers = {
-                "Content-Type": "image/jpg",
-                "Token": self.camera_token,
-                "Fingerprint": self.fingerprint,
-            }
-            response = requests.put(
+            response = self._session.put(
                 self.UPLOAD_URL,
-                headers=headers,
                 data=b"",  # Empty test
                 timeout=10,
             )
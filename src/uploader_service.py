@@ -37,8 +37,10 @@ def main():
 
     consecutive_failures = 0
     max_failures = 5
+    max_backoff = 300
 
     while True:
+        started = time.monotonic()
         try:
             # Capture image
             snapshot = camera.capture()
@@ -50,21 +52,25 @@ def main():
                     consecutive_failures = 0
                 else:
                     consecutive_failures += 1
-                    print(f"Upload failed ({consecutive_failures}/{max_failures}): {error}")
+                    print(f"Upload failed ({consecutive_failures} in a row): {error}")
             else:
                 consecutive_failures += 1
-                print(f"Capture failed ({consecutive_failures}/{max_failures})")
+                print(f"Capture failed ({consecutive_failures} in a row)")
 
-            # Back off if too many failures
+            # Back off if too many failures, doubling the wait (up to 5 min)
+            # for as long as the outage lasts
             if consecutive_failures >= max_failures:
-                print("Too many failures, waiting 60s...")
-                time.sleep(60)
-                consecutive_failures = 0
+                backoff = min(60 * 2 ** min(consecutive_failures - max_failures, 3), max_backoff)
+                print(f"Too many failures, waiting {backoff}s...")
+                time.sleep(backoff)
             else:
-                time.sleep(config.upload_interval)
+                # Pace from the start of the capture so the upload round-trip
+                # doesn't stretch the interval; go straight on if it overran
+                time.sleep(max(config.upload_interval - (time.monotonic() - started), 0))
 
         except KeyboardInterrupt:
             print("\nStopping upload service...")
+            uploader.close()
             break
         except Exception as e:
             print(f"Error: {e}")
@@ -6,6 +6,7 @@ import time
 import shutil
 import signal
 import subprocess
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List
@@ -22,11 +23,20 @@ class VideoProcessor:
     COMPLETE_MARKER = "video_complete"
     LOG_FILE = "video_creation.log"
     LOCAL_STORAGE_DIR = Path.home() / "timelapse_local"
+    HW_ENCODER = "h264_v4l2m2m"  # Raspberry Pi hardware H.264 encoder
+    HW_ENCODER_DEVICE = Path("/dev/video11")  # Its V4L2 node (absent on Pi 5)
 
     def __init__(self, config: Config):
         self.config = config
         self.storage_path = Path(config.nas_mount_point)
-        self._should_stop = False
+        # Set by SIGTERM/SIGINT; waits on it wake immediately on shutdown
+        self._stop_event = threading.Event()
+        self._hw_encoder: Optional[bool] = None  # Detected on first use
+        self._log_files: dict = {}  # Open session logs, see _log
+        # NAS session dirs already seen with video_complete; never rescanned
+        self._complete_sessions: set = set()
+        # Resolved once instead of a PATH search per encode
+        self._ffmpeg = shutil.which("ffmpeg") or "ffmpeg"
         self.nas = NASMount(
             nas_ip=config.nas_ip,
             share_path=config.nas_share,
@@ -34,42 +44,31 @@ class VideoProcessor:
             username=config.nas_username,
         )
 
-    def _check_nas_health(self, timeout: int = 5) -> bool:
-        """Quick write test to verify NAS is responsive."""
-        test_file = self.storage_path / ".health_check"
-
-        def timeout_handler(signum, frame):
-            raise TimeoutError("NAS health check timed out")
-
-        old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(timeout)
-
-        try:
-            test_file.write_text(f"health_check_{time.time()}")
-            test_file.unlink()
-            return True
-        except TimeoutError:
-            print(f"NAS health check timed out ({timeout}s) - skipping processing")
-            return False
-        except Exception as e:
-            print(f"NAS health check failed: {e}")
-            return False
-        finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
-
     def _log(self, session_path: Path, message: str):
         """Write message to session log file."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_line = f"[{timestamp}] {message}\n"
         try:
-            log_file = session_path / self.LOG_FILE
-            with open(log_file, "a") as f:
-                f.write(log_line)
+            # Keep the log open for the session instead of an open/close per
+            # line, which is several round-trips each on the NAS
+            f = self._log_files.get(session_path)
+            if f is None:
+                f = open(session_path / self.LOG_FILE, "a", buffering=64 * 1024)
+                self._log_files[session_path] = f
+            f.write(log_line)
         except Exception as e:
             print(f"Warning: Could not write to log: {e}")
         print(message)
 
+    def _close_log(self, session_path: Path):
+        """Flush and close a session's log file, if open."""
+        f = self._log_files.pop(session_path, None)
+        if f is not None:
+            try:
+                f.close()
+            except Exception as e:
+                print(f"Warning: Could not write to log: {e}")
+
     def _log_memory(self, session_path: Path):
         """Log current system memory status."""
         try:
@@ -95,12 +94,50 @@ class VideoProcessor:
         if rotation == 90:
             return "transpose=1"
         elif rotation == 180:
-            return "transpose=1,transpose=1"
+            # Two flips walk memory linearly (vflip is just a stride
+            # change); two transposes do strided writes into a new frame each
+            return "hflip,vflip"
         elif rotation == 270:
             return "transpose=2"
         return ""
 
-    def _run_ffmpeg(self, session_path: Path, output_path: Path) -> bool:
+    def _use_hw_encoder(self) -> bool:
+        """Whether to try the hardware encoder first (per video.encoder setting)."""
+        encoder = self.config.video_encoder
+        if encoder == "libx264":
+            return False
+        if encoder == self.HW_ENCODER:
+            return True
+        return self._hw_encoder_available()
+
+    def _hw_bitrate(self) -> int:
+        """
+        Bitrate for the hardware encoder, which has no CRF mode.
+
+        Derived from video.crf so one quality setting drives both encoders:
+        6 Mbps at CRF 18, halving every +6 CRF (x264's rule of thumb).
+        """
+        bitrate = 6_000_000 * 2 ** ((18 - self.config.video_crf) / 6)
+        return int(min(max(bitrate, 1_000_000), 20_000_000))
+
+    def _hw_encoder_available(self) -> bool:
+        """Check once whether FFmpeg can use the Pi's hardware H.264 encoder."""
+        if self._hw_encoder is None:
+            self._hw_encoder = False
+            if self.HW_ENCODER_DEVICE.exists():
+                try:
+                    result = subprocess.run(
+                        [self._ffmpeg, "-hide_banner", "-encoders"],
+                        capture_output=True,
+                        text=True,
+                        timeout=10,
+                    )
+                    self._hw_encoder = self.HW_ENCODER in result.stdout
+                except Exception:
+                    pass
+        return self._hw_encoder
+
+    def _run_ffmpeg(self, session_path: Path, output_path: Path, frame_count: int, hardware: bool = False) -> bool:
         """Run FFmpeg to local temp file, then copy to NAS. Returns True on success."""
         frames_dir = session_path / "frames"
         frame_pattern = str(frames_dir / "frame_%06d.jpg")
@@ -109,6 +146,8 @@ class VideoProcessor:
         local_tmp_dir = Path.home() / ".video_processing_tmp"
         local_tmp_dir.mkdir(parents=True, exist_ok=True)
         local_tmp_file = local_tmp_dir / output_path.name
+        # FFmpeg output goes to a file: an undrained pipe fills up and stalls long encodes
+        ffmpeg_log = local_tmp_dir / f"{output_path.stem}.ffmpeg.log"
 
         # Build video filter
         vf_parts = []
@@ -117,54 +156,76 @@ class VideoProcessor:
             vf_parts.append(rotation_filter)
 
         cmd = [
-            "ffmpeg",
+            self._ffmpeg,
             "-y",
+            # Only warnings and errors: progress output would be written to the
+            # SD card for the whole encode and is never read on success
+            "-hide_banner",
+            "-nostats",
+            "-loglevel", "warning",
             "-framerate", str(self.config.video_frame_rate),
+            # Frames are numbered from 0 with no gaps: skip start-number probing
+            # and stop after the last counted frame
+            "-start_number", "0",
             "-i", frame_pattern,
+            "-frames:v", str(frame_count),
         ]
 
         if vf_parts:
             cmd.extend(["-vf", ",".join(vf_parts)])
 
+        if hardware:
+            cmd.extend([
+                "-c:v", self.HW_ENCODER,
+                "-b:v", str(self._hw_bitrate()),
+            ])
+        else:
+            cmd.extend([
+                "-c:v", "libx264",
+                "-crf", str(self.config.video_crf),
+                "-preset", self.config.video_preset,
+                "-threads", "4",
+            ])
+            if self.config.video_tune != "none":
+                cmd.extend(["-tune", self.config.video_tune])
+            if self.config.video_x264_params:
+                cmd.extend(["-x264-params", self.config.video_x264_params])
+
         cmd.extend([
-            "-c:v", "libx264",
-            "-crf", str(self.config.video_crf),
-            "-preset", self.config.video_preset,
             "-pix_fmt", "yuv420p",
-            "-threads", "4",
             "-movflags", "+faststart",
             str(local_tmp_file),
         ])
 
         self._log(session_path, f"Encoding to local temp: {local_tmp_file}")
         self._log(session_path, f"Running: {' '.join(cmd)}")
+        # Flush so the log on disk shows the encode while it runs
+        self._close_log(session_path)
 
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-
-            timeout = 3600
-            start_time = time.time()
-
-            while process.poll() is None:
-                if time.time() - start_time > timeout:
-                    self._log(session_path, "ERROR: FFmpeg timeout (1 hour)")
-                    process.kill()
-                    return False
-                time.sleep(1)
+            with open(ffmpeg_log, "wb") as log_out:
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=log_out,
+                    stderr=subprocess.STDOUT,
+                )
+
+            try:
+                process.wait(timeout=3600)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                self._log(session_path, "ERROR: FFmpeg timeout (1 hour)")
+                return False
 
             if process.returncode == -9:
                 self._log(session_path, "ERROR: FFmpeg killed by signal 9 (likely out of memory)")
                 return False
             elif process.returncode != 0:
-                output = process.stdout.read() if process.stdout else ""
+                output = self._read_tail(ffmpeg_log, 1000)
                 self._log(session_path, f"ERROR: FFmpeg failed (code {process.returncode})")
                 if output:
-                    self._log(session_path, f"FFmpeg output: {output[:1000]}")
+                    self._log(session_path, f"FFmpeg output: {output}")
                 return False
 
             # FFmpeg succeeded — copy finished file to output location
@@ -178,13 +239,35 @@ class VideoProcessor:
             self._log(session_path, f"ERROR: FFmpeg/copy exception: {e}")
             return False
         finally:
-            # Clean up local temp file
-            if local_tmp_file.exists():
+            # Clean up local temp files
+            for tmp in (local_tmp_file, ffmpeg_log):
                 try:
-                    local_tmp_file.unlink()
+                    tmp.unlink(missing_ok=True)
                 except Exception:
                     pass
 
+    @staticmethod
+    def _read_tail(path: Path, max_bytes: int) -> str:
+        """Read the last max_bytes of a file (where FFmpeg puts its error)."""
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - max_bytes, 0))
+                return f.read().decode(errors="replace").strip()
+        except OSError:
+            return ""
+
+    @staticmethod
+    def _count_frames(frames_dir: Path) -> int:
+        """Count frame_*.jpg files in one directory pass, without building Paths."""
+        count = 0
+        with os.scandir(frames_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("frame_") and name.endswith(".jpg"):
+                    count += 1
+        return count
+
     def _is_local_session(self, session_path: Path) -> bool:
         """Check if session is in local storage (vs NAS)."""
         try:
@@ -228,6 +311,7 @@ class VideoProcessor:
                         shutil.copy2(str(frame), str(nas_frame))
 
             # Copy log file
+            self._close_log(session_path)
             local_log = session_path / self.LOG_FILE
             if local_log.exists():
                 shutil.copy2(str(local_log), str(nas_session / self.LOG_FILE))
@@ -249,6 +333,8 @@ class VideoProcessor:
         except OSError as e:
             self._log(session_path, f"NAS sync failed: {e} — video saved locally")
             return False
+        finally:
+            self._close_log(session_path)
 
     def _sync_completed_local_sessions(self):
         """Sync any completed local sessions to NAS.
@@ -285,6 +371,12 @@ class VideoProcessor:
 
     def process_session(self, session_path: Path) -> bool:
         """Process a single session to create video. Returns True on success."""
+        try:
+            return self._process_session(session_path)
+        finally:
+            self._close_log(session_path)
+
+    def _process_session(self, session_path: Path) -> bool:
         session_name = session_path.name
         is_local = self._is_local_session(session_path)
 
@@ -316,12 +408,13 @@ class VideoProcessor:
 
         try:
             frames_dir = session_path / "frames"
-            if not frames_dir.exists():
+            try:
+                frame_count = self._count_frames(frames_dir)
+            except FileNotFoundError:
                 self._log(session_path, "ERROR: No frames directory found")
                 processing_marker.unlink(missing_ok=True)
                 return False
 
-            frame_count = len(list(frames_dir.glob("frame_*.jpg")))
             if frame_count == 0:
                 self._log(session_path, "ERROR: No frames found in session")
                 processing_marker.unlink(missing_ok=True)
@@ -331,7 +424,20 @@ class VideoProcessor:
 
             output_path = session_path / f"{session_name}.mp4"
 
-            success = self._run_ffmpeg(session_path, output_path)
+            # Prefer the hardware encoder; fall back to libx264 if it fails
+            # (e.g. frame size beyond what the encoder supports). Sessions from
+            # aborted prints with only a handful of frames get no video, but are
+            # still completed so they sync and aren't retried.
+            success = False
+            if frame_count < self.config.video_min_frames:
+                self._log(session_path, f"Skipping video: {frame_count} frames is below min_frames ({self.config.video_min_frames})")
+                success = True
+            elif self._use_hw_encoder():
+                success = self._run_ffmpeg(session_path, output_path, frame_count, hardware=True)
+                if not success and not self._stop_event.is_set():
+                    self._log(session_path, "Hardware encode failed, retrying with libx264")
+            if not success and not self._stop_event.is_set():
+                success = self._run_ffmpeg(session_path, output_path, frame_count)
 
             if success:
                 complete_marker.touch()
@@ -362,6 +468,33 @@ class VideoProcessor:
             processing_marker.unlink(missing_ok=True)
             return False
 
+    def _scan_pending(self, search_dir: Path, skip_names: set, remember_complete: bool = False) -> List[Path]:
+        """Return session dirs under search_dir whose markers say they need a video.
+
+        One readdir per session instead of a stat per marker. With
+        remember_complete, finished sessions are remembered so later scans
+        skip them without touching the directory again.
+        """
+        pending = []
+        with os.scandir(search_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in skip_names or entry.path in self._complete_sessions:
+                    continue
+                if not entry.is_dir():
+                    continue
+                try:
+                    markers = set(os.listdir(entry.path))
+                except FileNotFoundError:
+                    continue  # Removed mid-scan (e.g. synced to NAS and cleaned up)
+                if self.COMPLETE_MARKER in markers:
+                    if remember_complete:
+                        self._complete_sessions.add(entry.path)
+                    continue
+                if self.READY_MARKER in markers and self.PROCESSING_MARKER not in markers:
+                    pending.append(Path(entry.path))
+        return pending
+
     def find_pending_sessions(self) -> List[Path]:
         """Find all sessions with ready_for_video marker.
 
@@ -369,38 +502,19 @@ class VideoProcessor:
         Deduplicates by session name to avoid processing the same session twice.
         """
         pending = []
-        seen_names = set()
 
         # Scan local storage first (always available, no NAS dependency)
-        if self.LOCAL_STORAGE_DIR.exists():
-            try:
-                for session_dir in self.LOCAL_STORAGE_DIR.iterdir():
-                    if not session_dir.is_dir():
-                        continue
-                    ready_marker = session_dir / self.READY_MARKER
-                    complete_marker = session_dir / self.COMPLETE_MARKER
-                    processing_marker = session_dir / self.PROCESSING_MARKER
-
-                    if ready_marker.exists() and not complete_marker.exists() and not processing_marker.exists():
-                        pending.append(session_dir)
-                        seen_names.add(session_dir.name)
-            except Exception as e:
-                print(f"Error scanning local sessions: {e}")
+        try:
+            pending = self._scan_pending(self.LOCAL_STORAGE_DIR, set())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error scanning local sessions: {e}")
+        seen_names = {p.name for p in pending}
 
         # Also scan NAS for legacy sessions (from before local-first migration)
         try:
-            if self.storage_path.exists():
-                for session_dir in self.storage_path.iterdir():
-                    if not session_dir.is_dir():
-                        continue
-                    if session_dir.name in seen_names:
-                        continue  # Already found locally
-                    ready_marker = session_dir / self.READY_MARKER
-                    complete_marker = session_dir / self.COMPLETE_MARKER
-                    processing_marker = session_dir / self.PROCESSING_MARKER
-
-                    if ready_marker.exists() and not complete_marker.exists() and not processing_marker.exists():
-                        pending.append(session_dir)
+            pending.extend(self._scan_pending(self.storage_path, seen_names, remember_complete=True))
         except OSError:
             pass  # NAS unavailable — local sessions still processable
         except Exception as e:
@@ -414,15 +528,18 @@ class VideoProcessor:
         try:
             if not search_dir.exists():
                 return
-            for session_dir in search_dir.iterdir():
-                if not session_dir.is_dir():
-                    continue
-
+            with os.scandir(search_dir) as entries:
+                session_dirs = [
+                    Path(entry.path) for entry in entries
+                    if entry.path not in self._complete_sessions and entry.is_dir()
+                ]
+            for session_dir in session_dirs:
                 processing_marker = session_dir / self.PROCESSING_MARKER
-                if not processing_marker.exists():
+                # One stat answers both "is there a marker" and "how old is it"
+                try:
+                    marker_age = now - processing_marker.stat().st_mtime
+                except FileNotFoundError:
                     continue
-
-                marker_age = now - processing_marker.stat().st_mtime
                 if marker_age < max_age_seconds:
                     continue
 
@@ -479,20 +596,32 @@ class VideoProcessor:
         print(f"  Rotation: {self.config.video_rotation} degrees")
         print(f"  Quality (CRF): {self.config.video_crf}")
         print(f"  Preset: {self.config.video_preset}")
+        if self.config.video_tune != "none":
+            print(f"  Tune: {self.config.video_tune}")
+        if self.config.video_x264_params:
+            print(f"  x264 params: {self.config.video_x264_params}")
+        print(f"  Minimum frames: {self.config.video_min_frames}")
+        if self._use_hw_encoder():
+            print(f"  Encoder: {self.HW_ENCODER} (hardware, {self._hw_bitrate() / 1e6:.1f} Mbps), libx264 fallback")
+        else:
+            print("  Encoder: libx264")
         print()
         print(f"Checking for completed sessions every {check_interval}s")
         print()
 
+        if not shutil.which(self._ffmpeg):
+            print("Warning: FFmpeg not found. Install with: sudo apt install -y ffmpeg")
+            print()
+
         if not self.config.video_enabled:
             print("Video processing is disabled in configuration.")
             print("Enable it by setting video.enabled = true in ~/.prusa_camera_config")
-            while not self._should_stop:
-                time.sleep(check_interval)
+            self._stop_event.wait()
             return
 
         def handle_signal(signum, frame):
             print("\nReceived shutdown signal...")
-            self._should_stop = True
+            self._stop_event.set()
 
         signal.signal(signal.SIGTERM, handle_signal)
         signal.signal(signal.SIGINT, handle_signal)
@@ -514,7 +643,7 @@ class VideoProcessor:
         last_nas_sync = time.time()
         NAS_SYNC_INTERVAL = 300
 
-        while not self._should_stop:
+        while not self._stop_event.is_set():
             try:
                 # Check NAS health and sync periodically
                 now = time.time()
@@ -546,16 +675,13 @@ class VideoProcessor:
                 if pending:
                     print(f"Found {len(pending)} session(s) ready for processing")
                     for session_path in pending:
-                        if self._should_stop:
+                        if self._stop_event.is_set():
                             break
                         self.process_session(session_path)
                 else:
                     print("Waiting for sessions...", end="\r", flush=True)
 
-                for _ in range(check_interval):
-                    if self._should_stop:
-                        break
-                    time.sleep(1)
+                self._stop_event.wait(check_interval)
 
             except KeyboardInterrupt:
                 print("\n\nStopping video processor...")
@@ -563,10 +689,10 @@ class VideoProcessor:
             except OSError as e:
                 print(f"\nStorage error: {e}")
                 nas_was_unavailable = True
-                time.sleep(check_interval)
+                self._stop_event.wait(check_interval)
             except Exception as e:
                 print(f"\nError in monitor loop: {e}")
-                time.sleep(60)
+                self._stop_event.wait(60)
 
         print("Video processor stopped.")
 